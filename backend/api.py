@@ -1,11 +1,23 @@
 # backend/api.py
-from fastapi import FastAPI, UploadFile, File, Form
+from fastapi import FastAPI, UploadFile, File, Form, Header, HTTPException, Body, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from backend.state import ClaimState
 from backend.graph import build_claim_graph
-import shutil
+from backend.scheduler import ClaimScheduler, ClaimRejected, estimate_claim_cost
+from backend.idempotency import IdempotencyConflict, ResultCache, claim_cache_key, payload_fingerprint
+from backend.store import ClaimStore
+from backend.utils.extractors import extractor_stats
+from backend.utils.claim_rules import RulesValidationError, get_rules, reload_rules
+import asyncio
+from datetime import datetime
+import hashlib
 import os
-from typing import List
+import shutil
+import tempfile
+import time
+import uuid
+from typing import List, Optional
 
 app = FastAPI(title="Claims Processing Agent API", version="1.0")
 
@@ -21,26 +33,61 @@ app.add_middleware(
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Admission control + weighted fair scheduling for graph runs
+scheduler = ClaimScheduler()
+
+# Nodes look up the active rules on every run, so rule swaps never need a recompile
+claim_graph = build_claim_graph()
+
+# Replays results for retried submissions and coalesces concurrent duplicates
+result_cache = ResultCache()
+
+# Every processed claim is persisted here for the ops query endpoints
+claim_store = ClaimStore()
+
+
+@app.on_event("shutdown")
+def flush_claim_store():
+    claim_store.close()
+
 
 @app.post("/process-claim")
 async def process_claim(
+    response: Response,
     user_input: str = Form(...),
     claimant_name: str = Form("Unknown"),
     incident_date: str = Form("Unknown"),
+    product_line: str = Form("default"),
     files: List[UploadFile] = File([]),
+    idempotency_key: Optional[str] = Header(None),
 ):
     """
     Receives claim details + uploaded files and processes them
-    through the claim agent graph.
+    through the claim agent graph. Repeats of the same submission
+    (or of the same Idempotency-Key) get the stored result back.
     """
 
-    # Save uploaded files locally for processing
+    # Hash uploads into temp files first; they only move into the claim's own
+    # directory if this submission actually runs (not on a replay), so a retry
+    # can never rewrite files an in-flight run is reading.
+    submission_dir = os.path.join(UPLOAD_DIR, uuid.uuid4().hex)
+    staged = []  # (temp path, final path)
     uploaded_paths = []
-    for file in files:
-        file_path = os.path.join(UPLOAD_DIR, file.filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+    file_hashes = []
+    for index, file in enumerate(files):
+        filename = os.path.basename(file.filename or "") or "upload"
+        file_path = os.path.join(submission_dir, filename)
+        if file_path in uploaded_paths:
+            file_path = os.path.join(submission_dir, f"{index}_{filename}")
+        fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=".part")
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as buffer:
+            while chunk := file.file.read(1024 * 1024):
+                digest.update(chunk)
+                buffer.write(chunk)
+        staged.append((tmp_path, file_path))
         uploaded_paths.append(file_path)
+        file_hashes.append(digest.hexdigest())
 
     # Create initial state
     state = ClaimState(
@@ -49,18 +96,165 @@ async def process_claim(
         incident_date=incident_date,
         incident_description=user_input,
         uploaded_files=uploaded_paths,
+        product_line=product_line,
+        submitted_at=datetime.now().isoformat(timespec="milliseconds"),
+    )
+
+    # Run through the LangGraph pipeline on the scheduler's workers
+    queued_at = time.monotonic()
+
+    def run_graph():
+        started = time.monotonic()
+        result_state = claim_graph.invoke(state)
+        result = {
+            "claim_id": uuid.uuid4().hex,
+            "claimant_name": result_state.claimant_name,
+            "incident_date": result_state.incident_date,
+            "claim_category": result_state.claim_category,
+            "validation_status": result_state.validation_status,
+            "missing_documents": result_state.missing_documents,
+            "notes": result_state.notes,
+            "rules_version": result_state.rules_version,
+        }
+        claim_store.save({
+            **result,
+            "created_at": state.submitted_at,
+            "product_line": product_line,
+            "category": result["claim_category"],
+            "timings": {
+                "queue_seconds": round(started - queued_at, 3),
+                "graph_seconds": round(time.monotonic() - started, 3),
+            },
+        })
+        return result
+
+    def start_run():
+        os.makedirs(submission_dir)
+        for tmp_path, file_path in staged:
+            os.replace(tmp_path, file_path)
+        return scheduler.submit(run_graph, estimate_claim_cost(uploaded_paths))
+
+    def discard_uploads(run_started: bool):
+        for tmp_path, _ in staged:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        if run_started:
+            shutil.rmtree(submission_dir, ignore_errors=True)
+
+    fields = [
+        ("user_input", user_input),
+        ("claimant_name", claimant_name),
+        ("incident_date", incident_date),
+        ("product_line", product_line),
+    ]
+    try:
+        rules_version = get_rules(product_line).version
+    except RulesValidationError as e:
+        discard_uploads(run_started=False)
+        raise HTTPException(status_code=400, detail=str(e))
+    payload_fp = payload_fingerprint(fields, file_hashes)
+    key = claim_cache_key(payload_fp, rules_version, product_line, idempotency_key)
+
+    # Cost estimation opens every PDF/image, so keep it off the event loop
+    try:
+        future, replayed = await run_in_threadpool(result_cache.get_or_run, key, start_run, payload_fp)
+    except IdempotencyConflict as e:
+        discard_uploads(run_started=False)
+        raise HTTPException(status_code=422, detail=str(e))
+    except ClaimRejected as e:
+        discard_uploads(run_started=True)
+        raise _deferred(e)
+    if replayed:
+        discard_uploads(run_started=False)
+    response.headers["Idempotent-Replayed"] = "true" if replayed else "false"
+
+    try:
+        result = await asyncio.wrap_future(future)
+    except ClaimRejected as e:
+        # We joined a duplicate whose own submission was shed
+        raise _deferred(e)
+
+    # Copy so callers can't mutate the cached result
+    return dict(result)
+
+
+def _deferred(e: ClaimRejected) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"Claim deferred: {e}. Please retry shortly.",
+        headers={"Retry-After": str(int(e.slo_seconds))},
     )
 
-    # Run through the LangGraph pipeline
-    graph = build_claim_graph()
-    result_state = graph.invoke(state)
 
-    return {
-        "claim_category": result_state.claim_category,
-        "validation_status": result_state.validation_status,
-        "missing_documents": result_state.missing_documents,
-        "notes": result_state.notes,
-    }
+@app.get("/rules/{product_line}")
+async def rules_info(product_line: str):
+    """Active rules version and categories for a product line."""
+    try:
+        rules = get_rules(product_line)
+    except RulesValidationError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"version": rules.version, "categories": rules.categories}
+
+
+@app.post("/rules/{product_line}/reload")
+async def rules_reload(product_line: str, rules: dict = Body(None)):
+    """
+    Hot-swap the rules for a product line, either from the posted JSON
+    or by re-reading its rules file. Invalid rules are rejected and the
+    current ones stay active.
+    """
+    try:
+        new_rules = reload_rules(product_line, rules)
+    except RulesValidationError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"version": new_rules.version, "categories": new_rules.categories}
+
+
+@app.get("/metrics/queue")
+async def queue_metrics():
+    """Queue depth, delay and shed counts per scheduling lane."""
+    return {**scheduler.metrics(), "result_cache": result_cache.metrics()}
+
+
+# The claims endpoints read sqlite, so they are plain `def` and FastAPI runs
+# them in its threadpool instead of blocking the event loop
+@app.get("/claims")
+def list_claims(
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+):
+    """
+    Processed claims, newest first, filtered by validation status, category
+    and submission time range. Use `next_cursor` to fetch the next page.
+    """
+    try:
+        return claim_store.query(status, category, since, until, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/claims/summary")
+def claims_summary():
+    """Claim counts by validation status and category."""
+    return claim_store.summary()
+
+
+@app.get("/claims/{claim_id}")
+def get_claim(claim_id: str):
+    record = claim_store.get(claim_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Claim not found")
+    return record
+
+
+@app.get("/metrics/extractors")
+async def extractor_metrics():
+    """Files, pages, errors and seconds spent per document format."""
+    return extractor_stats()
 
 
 @app.get("/")
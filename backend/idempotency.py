@@ -0,0 +1,153 @@
+# backend/idempotency.py
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Iterable, Optional, Tuple
+
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("CLAIM_IDEMPOTENCY_TTL", "900"))
+IDEMPOTENCY_MAX_ENTRIES = int(os.getenv("CLAIM_IDEMPOTENCY_MAX_ENTRIES", "10000"))
+
+
+class IdempotencyConflict(ValueError):
+    """Raised when an Idempotency-Key is reused with a different payload."""
+
+
+def payload_fingerprint(fields: Iterable[Tuple[str, str]], file_hashes: Iterable[str]) -> str:
+    """Hash of the form fields and uploaded file contents of a submission."""
+    digest = hashlib.sha256()
+    for name, value in sorted(fields):
+        digest.update(f"{name}={value}\0".encode("utf-8"))
+    for file_hash in sorted(file_hashes):
+        digest.update(f"file={file_hash}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def claim_cache_key(
+    payload_fp: str,
+    rules_version: str,
+    product_line: str,
+    idempotency_key: Optional[str] = None,
+) -> str:
+    """
+    Cache key for a submission. An explicit Idempotency-Key is scoped to the
+    product line (its payload is checked separately, see ResultCache.get_or_run);
+    otherwise the key covers the payload and the active rules version, so a
+    rules swap never replays a verdict made under old rules.
+    """
+    if idempotency_key:
+        return f"key:{product_line}:{idempotency_key.strip()}"
+    digest = hashlib.sha256(f"{payload_fp}\0rules={rules_version}".encode("utf-8"))
+    return "fp:" + digest.hexdigest()
+
+
+def _chain(source: Future, target: Future):
+    # Claims the target first: it may have been cancelled by its waiter
+    if not target.set_running_or_notify_cancel():
+        return
+    if source.cancelled():
+        target.cancel()
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+def _follow(source: Future) -> Future:
+    # Each caller waits on its own Future, so one client going away (and its
+    # wait being cancelled) can't cancel the run other duplicates are sharing
+    follower: Future = Future()
+    source.add_done_callback(lambda f: _chain(f, follower))
+    return follower
+
+
+class ResultCache:
+    """
+    TTL cache of claim results keyed by submission fingerprint.
+
+    Each entry holds a Future for the run that produced it, so a duplicate
+    arriving while the first run is still going waits on that same Future
+    instead of starting its own. Failed runs are dropped so a retry runs again.
+    """
+
+    def __init__(self, ttl_seconds: float = IDEMPOTENCY_TTL_SECONDS, max_entries: int = IDEMPOTENCY_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        # key -> [future, expires_at, payload fingerprint]
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_run(
+        self, key: str, start: Callable[[], Future], fingerprint: Optional[str] = None
+    ) -> Tuple[Future, bool]:
+        """
+        Return (future, replayed). Every caller gets its own future for the
+        shared run, safe to cancel. `start` is only called when there is no live
+        entry for `key`, and runs outside the cache lock; any exception it
+        raises propagates (and reaches duplicates already waiting) and nothing
+        is stored. Raises IdempotencyConflict if `key` is live with a different
+        `fingerprint`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                future, expires_at, stored_fp = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    if fingerprint is not None and stored_fp != fingerprint:
+                        raise IdempotencyConflict("Idempotency-Key was already used with a different request")
+                    self.hits += 1
+                    self._entries.move_to_end(key)
+                    return _follow(future), True
+                del self._entries[key]
+
+            self.misses += 1
+            # Placeholder so duplicates can join while `start` runs unlocked
+            placeholder: Future = Future()
+            self._entries[key] = [placeholder, None, fingerprint]  # no expiry while in flight
+            self._evict_locked()
+
+        placeholder.add_done_callback(lambda f: self._finished(key, f))
+        try:
+            future = start()
+        except BaseException as e:
+            placeholder.set_exception(e)
+            raise
+        future.add_done_callback(lambda f: _chain(f, placeholder))
+        return _follow(placeholder), False
+
+    def _finished(self, key: str, future: Future):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not future:
+                return
+            if future.cancelled() or future.exception() is not None:
+                del self._entries[key]
+            else:
+                entry[1] = time.monotonic() + self.ttl_seconds
+
+    def _evict_locked(self):
+        # Expired entries are otherwise dropped lazily on lookup
+        if len(self._entries) <= self.max_entries:
+            return
+        now = time.monotonic()
+        for key in [k for k, entry in self._entries.items() if entry[1] is not None and entry[1] <= now]:
+            del self._entries[key]
+        # Oldest completed entries go first; in-flight ones are never evicted
+        while len(self._entries) > self.max_entries:
+            victim = next((k for k, entry in self._entries.items() if entry[1] is not None), None)
+            if victim is None:
+                break
+            del self._entries[victim]
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "in_flight": sum(1 for entry in self._entries.values() if entry[1] is None),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -2,6 +2,9 @@
 from langchain_groq import ChatGroq
 from langgraph.graph import StateGraph, END
 from dotenv import load_dotenv
+from backend.utils.claim_rules import get_rules
+from backend.utils.entity_extractor import MIN_CONFIDENCE, extract_entities, unresolved_fields
+from datetime import datetime
 from typing import TypedDict, List, Optional
 import os
 
@@ -27,56 +30,81 @@ class ClaimState(TypedDict):
     missing_documents: Optional[List[str]]  # Missing required docs for the category
     validation_status: Optional[str]     # "pending", "pass", "fail"
     notes: Optional[str]   
+    submitted_at: Optional[str]  # ISO timestamp, anchors relative dates like "last week"
 
 # ---- Node function ----
 def claim_intake_node(state: ClaimState) -> ClaimState:
     import json
 
+    # Local deterministic pass first, resolved against the submission time
+    submitted_at = state.get("submitted_at")
+    reference_time = datetime.fromisoformat(submitted_at) if submitted_at else datetime.now()
+    entities = extract_entities(state["user_input"], reference_time)
+
+    # Default values
+    extracted = {
+        "claimant_name": "Unknown",
+        "incident_date": "Unknown",
+        "incident_description": "Unknown"
+    }
+    for key, result in entities.items():
+        if result["value"] and result["confidence"] >= MIN_CONFIDENCE:
+            extracted[key] = result["value"]
+
+    # Only ask the LLM for what the local pass couldn't resolve
+    pending = unresolved_fields(entities)
+    if not pending:
+        return {**state, **extracted}
+
+    field_lines = "\n".join(f"    - {key}" for key in pending)
+    json_lines = ",\n".join(f'        "{key}": "..."' for key in pending)
     prompt = f"""
     You are an insurance claims intake assistant.
 
     Extract the following details from the customer message if present:
-    - Claimant name
-    - Incident date
-    - Incident description
+{field_lines}
 
     If some details are missing, write "Unknown".
 
     Return ONLY valid JSON in the following format:
     {{
-        "claimant_name": "...",
-        "incident_date": "...",
-        "incident_description": "..."
+{json_lines}
     }}
 
     Customer message:
     {state['user_input']}
     """
 
-    response = llm.invoke(prompt)
+    try:
+        response = llm.invoke(prompt)
+    except Exception:
+        # Offline or LLM unavailable: fall back to low-confidence local values
+        response = None
 
     # Handle case where Groq returns a list of content chunks
     raw_output = ""
-    if isinstance(response.content, list):
+    if response is None:
+        pass
+    elif isinstance(response.content, list):
         raw_output = " ".join([c.get("text", "") for c in response.content])
     else:
         raw_output = str(response.content).strip()
 
-    # Default values
-    extracted = {
-        "claimant_name": "Unknown",
-        "incident_date": "Unknown",
-        "incident_description": "Unknown"
-    }
-
     # Try to parse JSON
+    parsed = {}
     try:
         parsed = json.loads(raw_output)
-        for key in extracted:
-            if parsed.get(key):
-                extracted[key] = parsed[key]
     except json.JSONDecodeError:
-        # If JSON fails, at least keep the description
+        pass
+    for key in pending:
+        value = parsed.get(key) if isinstance(parsed, dict) else None
+        if value and value != "Unknown":
+            extracted[key] = value
+        elif entities[key]["value"]:
+            extracted[key] = entities[key]["value"]
+
+    # If nothing else worked, at least keep the description
+    if extracted["incident_description"] == "Unknown":
         extracted["incident_description"] = state["user_input"]
 
     return {**state, **extracted}
@@ -147,18 +175,7 @@ def categorize_claim(state: ClaimState) -> ClaimState:
 def category_checklist(state: ClaimState) -> ClaimState:
     category = state["claim_category"]
     uploaded = state.get("uploaded_files", []) or []
-    required = []
-
-    if category == "Auto":
-        required = ["Driver’s License", "Vehicle Registration", "Accident Report"]
-    elif category == "Home":
-        required = ["Proof of Ownership", "Damage Photos", "Repair Estimates"]
-    elif category == "Health":
-        required = ["Medical Report", "Bills", "Insurance Card"]
-    elif category == "Travel":
-        required = ["Itinerary", "Proof of Expense", "Travel Insurance Policy"]
-    elif category == "Life":
-        required = ["Death Certificate", "Policy Document", "ID Proof"]
+    required = get_rules(state.get("product_line")).docs_for(category)
 
     missing = [doc for doc in required if doc not in uploaded]
 
@@ -198,19 +215,10 @@ def process_other_claim(state: ClaimState) -> ClaimState:
 
 
 def route_by_category(state: ClaimState) -> str:
-    category = state["claim_category"].lower()
-    if category == "Auto":
-        return "auto_checklist"
-    elif category == "Home":
-        return "home_checklist"
-    elif category == "Health":
-        return "health_checklist"
-    elif category == "Travel":
-        return "travel_checklist"
-    elif category == "Life":
-        return "life_checklist"
-    else:
+    category = get_rules(state.get("product_line")).resolve_category(state["claim_category"])
+    if category == "Other":
         return "process_other_claim"
+    return f"{category.lower()}_checklist"
     
 def checklist_router(state: ClaimState):
     if state.get("missing_documents"):
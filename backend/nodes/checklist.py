@@ -2,12 +2,12 @@ from backend.state import ClaimState
 
 # backend/nodes/category_checklist.py
 from ..main import ClaimState
-from .process_category import CATEGORY_REQUIRED_DOCS
+from backend.utils.claim_rules import get_rules
 
 def category_checklist(state: ClaimState) -> ClaimState:
     category = state.get("claim_category")
     uploaded = state.get("uploaded_files", []) or []
-    required = CATEGORY_REQUIRED_DOCS.get(category, [])
+    required = get_rules(state.get("product_line")).docs_for(category)
     missing = [doc for doc in required if doc not in uploaded]
     return {**state, "missing_documents": missing}
 
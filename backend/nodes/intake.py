@@ -1,13 +1,24 @@
 # backend/nodes/intake.py
+from datetime import datetime
 from backend.state import ClaimState
+from backend.utils.entity_extractor import MIN_CONFIDENCE, extract_entities
 
 def claim_intake_node(state: ClaimState) -> ClaimState:
     """
     Handles initial user input capture and basic normalization.
-    Later this can be extended with NLP entity extraction or Groq model parsing.
+    Name and date fields the form left as "Unknown" are filled from the
+    message by the local entity extractor when it is confident enough.
     """
     user_input = state.user_input or ""
     state.incident_description = user_input
     state.claimant_name = state.claimant_name or "Unknown"
     state.incident_date = state.incident_date or "Unknown"
+
+    reference_time = datetime.fromisoformat(state.submitted_at) if state.submitted_at else datetime.now()
+    entities = extract_entities(user_input, reference_time)
+    for key in ("claimant_name", "incident_date"):
+        result = entities[key]
+        if getattr(state, key) == "Unknown" and result["value"] and result["confidence"] >= MIN_CONFIDENCE:
+            setattr(state, key, result["value"])
+        state.extraction_confidence[key] = result["confidence"]
     return state
@@ -0,0 +1,273 @@
+# backend/scheduler.py
+import os
+import threading
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List
+
+from backend.utils.extractors import SNIFF_BYTES, sniff_bytes, sniff_format, zip_members
+
+# ---- Scheduler settings (override via environment) ----
+CLAIM_WORKERS = int(os.getenv("CLAIM_WORKERS", "4"))
+HEAVY_COST_THRESHOLD = float(os.getenv("CLAIM_HEAVY_COST_THRESHOLD", "25"))
+QUEUE_DELAY_SLO_SECONDS = float(os.getenv("CLAIM_QUEUE_DELAY_SLO", "30"))
+
+# Dispatch ratio between lanes: 3 light claims for every heavy one
+LANE_WEIGHTS = {"light": 3, "heavy": 1}
+
+# ---- Cost model weights ----
+COST_PER_FILE = 1.0
+COST_PER_MB = 0.5
+COST_PER_PDF_PAGE = 1.0
+COST_PER_MEGAPIXEL = 0.5
+# Zipped PDFs aren't parsed for pricing; assume a scanned-page-sized page
+PDF_BYTES_PER_PAGE_ESTIMATE = 150 * 1024
+
+IMAGE_FORMATS = {"png", "jpeg", "tiff", "heic"}
+
+
+class ClaimRejected(Exception):
+    """Raised when a claim is shed because its lane is over the queue-delay SLO."""
+
+    def __init__(self, lane: str, expected_delay: float, slo_seconds: float):
+        self.lane = lane
+        self.expected_delay = expected_delay
+        self.slo_seconds = slo_seconds
+        super().__init__(
+            f"{lane} queue delay {expected_delay:.1f}s exceeds SLO of {slo_seconds:g}s"
+        )
+
+
+# ---- Cost estimation ----
+def _image_cost(stream) -> float:
+    from PIL import Image
+
+    # Image.open only reads the header, so this doesn't decode pixels
+    with Image.open(stream) as img:
+        width, height = img.size
+        frames = getattr(img, "n_frames", 1)
+    return (width * height * frames / 1_000_000) * COST_PER_MEGAPIXEL
+
+
+def _zip_cost(file_path: str) -> float:
+    # Price each member from the central directory and its first bytes only;
+    # member PDFs aren't parsed, their page count is estimated from size
+    cost = 0.0
+    with zipfile.ZipFile(file_path) as zf:
+        for member in zip_members(zf):
+            cost += COST_PER_FILE + (member.file_size / (1024 * 1024)) * COST_PER_MB
+            try:
+                with zf.open(member) as stream:
+                    fmt = sniff_bytes(stream.read(SNIFF_BYTES))
+                if fmt == "pdf":
+                    cost += max(1, member.file_size // PDF_BYTES_PER_PAGE_ESTIMATE) * COST_PER_PDF_PAGE
+                elif fmt in IMAGE_FORMATS:
+                    with zf.open(member) as stream:
+                        cost += _image_cost(stream)
+            except Exception:
+                pass
+    return cost
+
+
+def _file_cost(file_path: str) -> float:
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        return COST_PER_FILE
+
+    cost = COST_PER_FILE + (size / (1024 * 1024)) * COST_PER_MB
+    fmt = sniff_format(file_path)
+    try:
+        if fmt == "pdf":
+            import pdfplumber
+
+            with pdfplumber.open(file_path) as pdf:
+                cost += len(pdf.pages) * COST_PER_PDF_PAGE
+        elif fmt in IMAGE_FORMATS:
+            cost += _image_cost(file_path)
+        elif fmt == "zip":
+            cost += _zip_cost(file_path)
+    except Exception:
+        pass
+    return cost
+
+
+def estimate_claim_cost(uploaded_files: List[str]) -> float:
+    """
+    Rough processing cost of a claim before it runs, from upload count,
+    file sizes, PDF page counts and image pixel counts (including the
+    members of ZIP bundles).
+    """
+    return sum(_file_cost(path) for path in uploaded_files)
+
+
+def lane_for_cost(cost: float) -> str:
+    return "heavy" if cost >= HEAVY_COST_THRESHOLD else "light"
+
+
+# ---- Scheduler ----
+class _Job:
+    __slots__ = ("fn", "cost", "lane", "future", "enqueued_at", "started_at")
+
+    def __init__(self, fn: Callable, cost: float, lane: str):
+        self.fn = fn
+        self.cost = cost
+        self.lane = lane
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+        self.started_at = None
+
+
+class ClaimScheduler:
+    """
+    Admission control and weighted fair scheduling in front of graph execution.
+
+    Claims are split into a light and a heavy lane by estimated cost. Workers
+    serve the lanes by weighted round robin, so a burst of heavy claims can't
+    starve simple ones, and heavy claims never hold every worker: one is
+    always left for the light lane. A claim is shed at submission when the
+    expected wait in its lane, given the workers it can use and the work
+    still ahead of it, is over the queue-delay SLO.
+    """
+
+    def __init__(
+        self,
+        workers: int = CLAIM_WORKERS,
+        slo_seconds: float = QUEUE_DELAY_SLO_SECONDS,
+        weights: Dict[str, int] = None,
+    ):
+        self.workers = workers
+        self.slo_seconds = slo_seconds
+        self.weights = dict(weights or LANE_WEIGHTS)
+        self._lanes: Dict[str, deque] = {lane: deque() for lane in self.weights}
+        self._cond = threading.Condition()
+        self._schedule = [lane for lane, w in self.weights.items() for _ in range(w)]
+        self._cursor = 0
+        self._running: List[_Job] = []
+
+        # Per-lane counters and EWMA of service seconds per unit of cost
+        self._stats = {
+            lane: {
+                "admitted": 0,
+                "shed": 0,
+                "completed": 0,
+                "seconds_per_cost": 1.0,
+                "last_queue_delay": 0.0,
+            }
+            for lane in self.weights
+        }
+
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"claim-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def expected_delay(self, lane: str) -> float:
+        """Estimated wait for a new claim joining `lane`."""
+        with self._cond:
+            return self._expected_delay_locked(lane)
+
+    def _capacity(self, lane: str) -> int:
+        # Heavy claims may use every worker but one, so light claims never queue
+        # behind a full set of long-running jobs
+        if lane == "heavy":
+            return max(self.workers - 1, 1)
+        return self.workers
+
+    def _expected_delay_locked(self, lane: str) -> float:
+        capacity = self._capacity(lane)
+        idle = self.workers - len(self._running)
+        if lane == "heavy":
+            idle = min(idle, capacity - sum(1 for job in self._running if job.lane == lane))
+        # Starts at once if a usable worker is still idle after the claims already queued
+        if idle > len(self._lanes[lane]):
+            return 0.0
+        now = time.monotonic()
+        seconds_per_cost = self._stats[lane]["seconds_per_cost"]
+        remaining = sum(
+            max(job.cost * self._stats[job.lane]["seconds_per_cost"] - (now - job.started_at), 0.0)
+            for job in self._running
+            if lane == "light" or job.lane == lane
+        )
+        queued = sum(job.cost for job in self._lanes[lane]) * seconds_per_cost
+        return (queued + remaining) / capacity
+
+    def submit(self, fn: Callable, cost: float) -> Future:
+        """
+        Queue `fn` for execution. Returns a Future with its result,
+        or raises ClaimRejected if the lane is over its SLO.
+        """
+        lane = lane_for_cost(cost)
+        job = _Job(fn, cost, lane)
+        with self._cond:
+            delay = self._expected_delay_locked(lane)
+            if delay > self.slo_seconds:
+                self._stats[lane]["shed"] += 1
+                raise ClaimRejected(lane, delay, self.slo_seconds)
+            self._lanes[lane].append(job)
+            self._stats[lane]["admitted"] += 1
+            self._cond.notify()
+        return job.future
+
+    def _next_job(self):
+        # Weighted round robin over non-empty lanes that are under their worker cap
+        for _ in range(len(self._schedule)):
+            lane = self._schedule[self._cursor]
+            self._cursor = (self._cursor + 1) % len(self._schedule)
+            if not self._lanes[lane]:
+                continue
+            running = sum(1 for job in self._running if job.lane == lane)
+            if running < self._capacity(lane):
+                return lane, self._lanes[lane].popleft()
+        return None, None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                lane, job = self._next_job()
+                while job is None:
+                    self._cond.wait()
+                    lane, job = self._next_job()
+                job.started_at = time.monotonic()
+                self._running.append(job)
+                self._stats[lane]["last_queue_delay"] = job.started_at - job.enqueued_at
+
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    job.future.set_result(job.fn())
+                except BaseException as e:
+                    job.future.set_exception(e)
+            elapsed = time.monotonic() - job.started_at
+
+            with self._cond:
+                self._running.remove(job)
+                # A freed heavy slot may unblock a worker waiting on the heavy cap
+                self._cond.notify()
+                stats = self._stats[lane]
+                stats["completed"] += 1
+                observed = elapsed / max(job.cost, 1e-6)
+                stats["seconds_per_cost"] = 0.8 * stats["seconds_per_cost"] + 0.2 * observed
+
+    def metrics(self) -> Dict:
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "in_flight": len(self._running),
+                "queue_delay_slo_seconds": self.slo_seconds,
+                "lanes": {
+                    lane: {
+                        "depth": len(self._lanes[lane]),
+                        "queued_cost": round(sum(job.cost for job in self._lanes[lane]), 2),
+                        "expected_delay_seconds": round(self._expected_delay_locked(lane), 3),
+                        "last_queue_delay_seconds": round(stats["last_queue_delay"], 3),
+                        "admitted": stats["admitted"],
+                        "shed": stats["shed"],
+                        "completed": stats["completed"],
+                    }
+                    for lane, stats in self._stats.items()
+                },
+            }
@@ -12,6 +12,10 @@ class ClaimState:
     missing_documents: List[str] = field(default_factory=list)
     validation_status: Optional[str] = None
     notes: Optional[str] = None
+    product_line: str = "default"
+    rules_version: Optional[str] = None
+    submitted_at: Optional[str] = None  # ISO timestamp, anchors relative dates
+    extraction_confidence: Dict[str, float] = field(default_factory=dict)
 
     # This lets LangGraph treat ClaimState as a dict-like object
     def __getitem__(self, key):
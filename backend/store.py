@@ -0,0 +1,262 @@
+# backend/store.py
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+CLAIM_STORE_PATH = os.getenv("CLAIM_STORE_PATH", "claims.db")
+# Writes are grouped into one transaction per batch, flushed when full or after the interval
+STORE_BATCH_SIZE = int(os.getenv("CLAIM_STORE_BATCH_SIZE", "200"))
+STORE_FLUSH_INTERVAL = float(os.getenv("CLAIM_STORE_FLUSH_INTERVAL", "0.5"))
+MAX_PAGE_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    claim_id TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL,
+    product_line TEXT,
+    claimant_name TEXT,
+    incident_date TEXT,
+    category TEXT,
+    validation_status TEXT,
+    missing_documents TEXT,
+    notes TEXT,
+    timings TEXT,
+    rules_version TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_claims_created ON claims (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_claims_status ON claims (validation_status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_claims_category ON claims (category, created_at, id);
+
+CREATE TABLE IF NOT EXISTS claim_counts (
+    category TEXT NOT NULL,
+    validation_status TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (category, validation_status)
+);
+"""
+
+COLUMNS = [
+    "claim_id", "created_at", "product_line", "claimant_name", "incident_date",
+    "category", "validation_status", "missing_documents", "notes", "timings", "rules_version",
+]
+JSON_COLUMNS = {"missing_documents", "timings"}
+
+_STOP = object()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _row_to_dict(row: sqlite3.Row) -> Dict:
+    record = {key: row[key] for key in COLUMNS}
+    for key in JSON_COLUMNS:
+        record[key] = json.loads(record[key]) if record[key] else None
+    return record
+
+
+def encode_cursor(created_at: str, row_id: int) -> str:
+    return f"{created_at}|{row_id}"
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, row_id = cursor.rsplit("|", 1)
+        return created_at, int(row_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+
+def parse_timestamp(value: str, name: str = "timestamp") -> str:
+    """
+    Normalizes an ISO date or datetime to the stored created_at format
+    (naive local time, milliseconds), so range filters compare correctly.
+    """
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid {name}: {value!r} is not an ISO date or datetime")
+    if moment.tzinfo is not None:
+        moment = moment.astimezone().replace(tzinfo=None)
+    return moment.isoformat(timespec="milliseconds")
+
+
+class ClaimStore:
+    """
+    Persists processed claims to sqlite (WAL mode) for the ops query API.
+
+    `save` only enqueues the record; a single writer thread commits them in
+    batches and keeps the per-category/status counts table in the same
+    transaction, so the summary never needs a full scan.
+    """
+
+    def __init__(self, path: str = CLAIM_STORE_PATH):
+        self.path = path
+        conn = _connect(path)
+        conn.executescript(SCHEMA)
+        conn.close()
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="claim-store-writer", daemon=True)
+        self._writer.start()
+
+    # ---- Writes ----
+    def save(self, record: Dict):
+        """Queue a processed claim for persistence. Never blocks on disk."""
+        self._queue.put(record)
+
+    def _write_loop(self):
+        conn = _connect(self.path)
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            # Collect more records until the batch is full or the flush deadline,
+            # counted from the first record, passes
+            deadline = time.monotonic() + STORE_FLUSH_INTERVAL
+            while len(batch) < STORE_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(conn, batch)
+        conn.close()
+
+    def _flush(self, conn: sqlite3.Connection, batch: List[Dict]):
+        # Never let an exception escape: a dead writer would silently drop every later save
+        try:
+            self._write_batch(conn, batch)
+            return
+        except Exception as e:
+            print(f"Claim store batch write error, retrying records one by one: {e}")
+        for record in batch:
+            try:
+                self._write_batch(conn, [record])
+            except Exception as e:
+                print(f"Claim store dropped record {record.get('claim_id')!r}: {e}")
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Dict]):
+        insert = (
+            f"INSERT OR IGNORE INTO claims ({', '.join(COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in COLUMNS)})"
+        )
+        counts: Dict[tuple, int] = {}
+        with conn:
+            for record in batch:
+                row = tuple(
+                    json.dumps(record.get(key)) if key in JSON_COLUMNS else record.get(key)
+                    for key in COLUMNS
+                )
+                # Only count rows actually inserted; a duplicate claim_id is ignored
+                if conn.execute(insert, row).rowcount:
+                    group = (record.get("category") or "Unknown", record.get("validation_status") or "Unknown")
+                    counts[group] = counts.get(group, 0) + 1
+            conn.executemany(
+                "INSERT INTO claim_counts (category, validation_status, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (category, validation_status) DO UPDATE SET count = count + excluded.count",
+                [(category, status, n) for (category, status), n in counts.items()],
+            )
+
+    def close(self):
+        """Flush pending writes and stop the writer thread."""
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    # ---- Reads ----
+    def get(self, claim_id: str) -> Optional[Dict]:
+        conn = _connect(self.path)
+        try:
+            row = conn.execute(
+                f"SELECT id, {', '.join(COLUMNS)} FROM claims WHERE claim_id = ?", (claim_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return _row_to_dict(row) if row else None
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        category: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Dict:
+        """
+        Newest-first page of claims matching the filters. `since`/`until` are
+        ISO dates or timestamps (inclusive/exclusive); ValueError if they
+        don't parse. Pass the returned `next_cursor` back to get the following page.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        clauses, params = [], []
+        if status:
+            clauses.append("validation_status = ?")
+            params.append(status)
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(parse_timestamp(since, "since"))
+        if until:
+            clauses.append("created_at < ?")
+            params.append(parse_timestamp(until, "until"))
+        if cursor:
+            created_at, row_id = decode_cursor(cursor)
+            clauses.append("(created_at < ? OR (created_at = ? AND id < ?))")
+            params.extend([created_at, created_at, row_id])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            f"SELECT id, {', '.join(COLUMNS)} FROM claims {where} "
+            f"ORDER BY created_at DESC, id DESC LIMIT ?"
+        )
+        conn = _connect(self.path)
+        try:
+            rows = conn.execute(sql, [*params, limit + 1]).fetchall()
+        finally:
+            conn.close()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        return {"items": [_row_to_dict(row) for row in rows], "next_cursor": next_cursor}
+
+    def summary(self) -> Dict:
+        """Claim counts by status and category, from the maintained aggregates."""
+        conn = _connect(self.path)
+        try:
+            rows = conn.execute("SELECT category, validation_status, count FROM claim_counts").fetchall()
+        finally:
+            conn.close()
+
+        by_status: Dict[str, int] = {}
+        by_category: Dict[str, int] = {}
+        for row in rows:
+            by_status[row["validation_status"]] = by_status.get(row["validation_status"], 0) + row["count"]
+            by_category[row["category"]] = by_category.get(row["category"], 0) + row["count"]
+        return {
+            "total": sum(by_status.values()),
+            "by_status": by_status,
+            "by_category": by_category,
+        }
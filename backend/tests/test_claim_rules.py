@@ -0,0 +1,90 @@
+# backend/tests/test_claim_rules.py
+import copy
+import json
+import os
+
+import pytest
+
+from backend.utils import claim_rules
+from backend.utils.claim_rules import ClaimRules, RulesValidationError
+
+DEFAULT_RULES = os.path.join(os.path.dirname(os.path.dirname(__file__)), "rules", "default.json")
+
+
+@pytest.fixture
+def rules_data():
+    with open(DEFAULT_RULES, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def rules_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(claim_rules, "CLAIM_RULES_DIR", str(tmp_path))
+    monkeypatch.setattr(claim_rules, "_active", {})
+    return tmp_path
+
+
+def test_default_rules_compile(rules_data):
+    rules = ClaimRules(rules_data)
+    assert rules.docs_for("Auto") == ["Driver’s License", "Vehicle Registration", "Accident Report"]
+    assert rules.document_matches("ID Proof", "scan of my PASSPORT")
+    assert not rules.document_matches("ID Proof", "hospital invoice")
+    assert rules.resolve_category(" health ") == "Health"
+    assert rules.resolve_category("Pets") == "Other"
+
+
+def test_version_tracks_content(rules_data):
+    changed = copy.deepcopy(rules_data)
+    changed["documents"]["Bills"].append("Statement")
+    assert ClaimRules(rules_data).version == ClaimRules(copy.deepcopy(rules_data)).version
+    assert ClaimRules(rules_data).version != ClaimRules(changed).version
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda d: d.pop("categories"),
+    lambda d: d["categories"].pop("Other"),
+    lambda d: d["categories"]["Auto"]["required_docs"].append("Unknown Doc"),
+    lambda d: d["categories"]["Auto"].__setitem__("message", 5),
+    lambda d: d.__setitem__("version", 2),
+    lambda d: d["documents"].__setitem__("Bills", []),
+])
+def test_invalid_rules_rejected(rules_data, mutate):
+    mutate(rules_data)
+    with pytest.raises(RulesValidationError):
+        ClaimRules(rules_data)
+
+
+def test_reload_persists_and_swaps(rules_dir, rules_data):
+    rules = claim_rules.reload_rules("acme", rules_data)
+    assert (rules_dir / "acme.json").exists()
+    assert claim_rules.get_rules("acme") is rules
+    assert claim_rules.load_rules("acme").version == rules.version
+
+
+def test_invalid_reload_keeps_active_rules(rules_dir, rules_data):
+    active = claim_rules.reload_rules("acme", rules_data)
+    with pytest.raises(RulesValidationError):
+        claim_rules.reload_rules("acme", {"categories": {}})
+    assert claim_rules.get_rules("acme") is active
+
+
+def test_product_line_name_is_checked(rules_dir, rules_data):
+    with pytest.raises(RulesValidationError):
+        claim_rules.reload_rules("../evil", rules_data)
+
+
+def test_file_change_is_picked_up(rules_dir, rules_data):
+    # Another worker process serving the reload only shares the file with us
+    active = claim_rules.reload_rules("acme", rules_data)
+    changed = copy.deepcopy(rules_data)
+    changed["documents"]["Bills"].append("Statement")
+    claim_rules._write_rules_file(str(rules_dir / "acme.json"), changed)
+    os.utime(rules_dir / "acme.json", ns=(0, 1))
+    assert claim_rules.get_rules("acme").version == ClaimRules(changed, "acme").version != active.version
+
+
+def test_bad_file_on_disk_keeps_active_rules(rules_dir, rules_data):
+    active = claim_rules.reload_rules("acme", rules_data)
+    (rules_dir / "acme.json").write_text("{not json", encoding="utf-8")
+    os.utime(rules_dir / "acme.json", ns=(0, 1))
+    assert claim_rules.get_rules("acme") is active
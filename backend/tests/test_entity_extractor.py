@@ -0,0 +1,106 @@
+# backend/tests/test_entity_extractor.py
+from datetime import datetime
+
+import pytest
+
+from backend.utils.entity_extractor import (
+    MIN_CONFIDENCE,
+    extract_claimant_name,
+    extract_entities,
+    extract_incident_date,
+    unresolved_fields,
+)
+
+SUBMITTED = datetime(2025, 8, 20, 10, 30)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Rear-ended on 2025-08-12", "2025-08-12"),
+    ("Car accident on August 12th", "2025-08-12"),
+    ("Accident on Aug 12, 2024", "2024-08-12"),
+    ("It happened on the 3rd of March 2025", "2025-03-03"),
+    ("Crash on 08/01/2025", "2025-08-01"),
+    ("Crash on 13/08/2025", "2025-08-13"),
+    ("Flight cancelled yesterday", "2025-08-19"),
+    ("House fire 3 days ago", "2025-08-17"),
+    ("Slipped last Friday", "2025-08-15"),
+    ("I was in a car accident last week", "2025-08-13"),
+])
+def test_incident_date_resolved(text, expected):
+    value, confidence = extract_incident_date(text, SUBMITTED)
+    assert value == expected
+    assert confidence >= MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("text", [
+    "Invoice 1.2.123",
+    "may 5 things happen",
+    "Policy 12345",
+])
+def test_incident_date_false_positives(text):
+    assert extract_incident_date(text, SUBMITTED) == (None, 0.0)
+
+
+def test_month_without_year_is_most_recent_past():
+    value, _ = extract_incident_date("Storm damage on Dec 24", SUBMITTED)
+    assert value == "2024-12-24"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("My name is John Doe. Car accident today", "John Doe"),
+    ("Hi, I am Alice Smith and I had surgery", "Alice Smith"),
+    ("Signed, Mary Ann Lee", "Mary Ann Lee"),
+])
+def test_claimant_name(text, expected):
+    name, confidence = extract_claimant_name(text)
+    assert name == expected
+    assert confidence >= MIN_CONFIDENCE
+
+
+def test_claimant_name_ignores_non_names():
+    assert extract_claimant_name("I am writing about my claim") == (None, 0.0)
+
+
+def test_confidences_are_rounded():
+    _, confidence = extract_claimant_name("This is Bob.")
+    assert confidence == 0.55
+
+
+@pytest.mark.parametrize("text", ["This is Urgent: car accident", "I'm Bob"])
+def test_single_word_names_go_to_llm(text):
+    _, confidence = extract_claimant_name(text)
+    assert confidence < MIN_CONFIDENCE
+
+
+def test_single_word_after_my_name_is_is_kept():
+    name, confidence = extract_claimant_name("My name is Bob")
+    assert name == "Bob" and confidence >= MIN_CONFIDENCE
+
+
+def test_feb_29_without_year_goes_back_to_a_leap_year():
+    value, _ = extract_incident_date("Accident on Feb 29", datetime(2028, 2, 10))
+    assert value == "2024-02-29"
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("My DOB is 1985-03-02, crash yesterday", "2025-08-19"),
+    ("Bought the car on 2024-01-10; the crash was on 2025-08-12", "2025-08-12"),
+])
+def test_incident_date_among_other_dates(text, expected):
+    value, confidence = extract_incident_date(text, SUBMITTED)
+    assert value == expected
+    assert confidence >= MIN_CONFIDENCE
+
+
+def test_ambiguous_dates_go_to_llm():
+    _, confidence = extract_incident_date("Policy renewed 2025-01-01 and claim for 2025-08-12", SUBMITTED)
+    assert confidence < MIN_CONFIDENCE
+
+
+def test_birth_date_alone_is_not_an_incident_date():
+    assert extract_incident_date("Date of birth: 1985-03-02", SUBMITTED) == (None, 0.0)
+
+
+def test_unresolved_fields_go_to_llm():
+    entities = extract_entities("Car accident last month", SUBMITTED)
+    assert unresolved_fields(entities) == ["claimant_name", "incident_date"]
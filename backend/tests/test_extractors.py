@@ -0,0 +1,81 @@
+# backend/tests/test_extractors.py
+import zipfile
+
+import pytest
+
+from backend.utils import extractors
+from backend.utils.extractors import iter_pages, sniff_bytes, sniff_format, zip_members
+
+
+@pytest.mark.parametrize("head, expected", [
+    (b"%PDF-1.7\n", "pdf"),
+    (b"\x89PNG\r\n\x1a\n\x00\x00", "png"),
+    (b"\xff\xd8\xff\xe0\x00\x10JFIF", "jpeg"),
+    (b"II*\x00\x08\x00", "tiff"),
+    (b"MM\x00*\x00\x00", "tiff"),
+    (b"\x00\x00\x00\x18ftypheic\x00\x00\x00\x00mif1heic", "heic"),
+    (b"\x00\x00\x00\x18ftypmif1\x00\x00\x00\x00mif1heic", "heic"),
+    (b"\x00\x00\x00\x1cftypavif\x00\x00\x00\x00avifmif1miaf", None),
+    (b"PK\x03\x04", "zip"),
+    (b"Police report no. 1234", "text"),
+    (b"\x00\x01\x02\x03", None),
+])
+def test_sniff_bytes(head, expected):
+    assert sniff_bytes(head) == expected
+
+
+def test_misleading_extension_uses_content(tmp_path):
+    path = tmp_path / "scan.pdf"
+    path.write_text("Accident report number 42")
+    assert sniff_format(str(path)) == "text"
+    assert list(iter_pages(str(path))) == ["Accident report number 42"]
+
+
+def test_docx_detected_inside_zip_container(tmp_path):
+    path = tmp_path / "report.jpg"
+    ns = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{ns}"><w:body><w:p><w:r><w:t>Medical Report</w:t></w:r></w:p></w:body></w:document>',
+        )
+    assert sniff_format(str(path)) == "docx"
+    assert list(iter_pages(str(path))) == ["Medical Report"]
+
+
+def test_zip_limits(tmp_path, monkeypatch):
+    monkeypatch.setattr(extractors, "ZIP_MAX_TOTAL_BYTES", 2_500)
+    path = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("bomb.txt", b"a" * 1_000_000)
+        for i in range(3):
+            zf.writestr(f"note{i}.txt", f"Receipt {i} ".encode() * 100)
+    with zipfile.ZipFile(path) as zf:
+        names = [m.filename for m in zip_members(zf)]
+    # The bomb fails the ratio check; the total cap stops after two notes
+    assert names == ["note0.txt", "note1.txt"]
+
+
+def test_bad_zip_member_keeps_the_rest(tmp_path):
+    path = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("broken.pdf", b"%PDF-1.7 truncated")
+        zf.writestr("note.txt", b"Repair invoice")
+    assert list(iter_pages(str(path)))[-1] == "Repair invoice"
+
+
+def test_bad_tiff_frame_keeps_the_rest(tmp_path, monkeypatch):
+    Image = pytest.importorskip("PIL.Image")
+    path = tmp_path / "scan.tiff"
+    first, second = Image.new("RGB", (8, 8)), Image.new("RGB", (8, 8))
+    first.save(path, save_all=True, append_images=[second])
+    frames = iter(["", "Police report"])
+
+    def ocr(image):
+        text = next(frames)
+        if not text:
+            raise RuntimeError("tesseract crashed")
+        return text
+
+    monkeypatch.setattr(extractors, "_ocr", ocr)
+    assert list(iter_pages(str(path))) == ["", "Police report"]
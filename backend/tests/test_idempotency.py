@@ -0,0 +1,77 @@
+# backend/tests/test_idempotency.py
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from backend.idempotency import IdempotencyConflict, ResultCache, claim_cache_key, payload_fingerprint
+
+
+def test_duplicates_share_the_first_run():
+    cache = ResultCache()
+    run = Future()
+    first, replayed = cache.get_or_run("k", lambda: run)
+    second, replayed_again = cache.get_or_run("k", lambda: pytest.fail("started twice"))
+    assert (replayed, replayed_again) == (False, True)
+
+    run.set_result({"validation_status": "success"})
+    assert first.result(timeout=1) == second.result(timeout=1) == {"validation_status": "success"}
+
+
+def test_entries_expire_after_ttl():
+    cache = ResultCache(ttl_seconds=0.05)
+    run = Future()
+    run.set_result("done")
+    cache.get_or_run("k", lambda: run)
+    time.sleep(0.1)
+    _, replayed = cache.get_or_run("k", lambda: Future())
+    assert not replayed
+
+
+def test_failed_runs_are_not_cached():
+    cache = ResultCache()
+    run = Future()
+    cache.get_or_run("k", lambda: run)
+    run.set_exception(RuntimeError("boom"))
+    _, replayed = cache.get_or_run("k", lambda: Future())
+    assert not replayed
+
+
+def test_start_errors_propagate_and_are_not_cached():
+    cache = ResultCache()
+
+    def start():
+        raise RuntimeError("shed")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_run("k", start)
+    assert cache.metrics()["entries"] == 0
+
+
+def test_idempotency_key_reused_with_other_payload():
+    cache = ResultCache()
+    cache.get_or_run("key:default:abc", lambda: Future(), fingerprint="one")
+    with pytest.raises(IdempotencyConflict):
+        cache.get_or_run("key:default:abc", lambda: Future(), fingerprint="two")
+
+
+def test_cache_keys():
+    fp = payload_fingerprint([("user_input", "crash"), ("product_line", "default")], ["h1", "h2"])
+    assert fp == payload_fingerprint([("product_line", "default"), ("user_input", "crash")], ["h2", "h1"])
+    # A rules swap changes the key, an Idempotency-Key is scoped per product line
+    assert claim_cache_key(fp, "v1", "default") != claim_cache_key(fp, "v2", "default")
+    assert claim_cache_key(fp, "v1", "auto", "abc") != claim_cache_key(fp, "v1", "home", "abc")
+
+
+def test_cancelled_waiter_leaves_the_shared_run_alone():
+    cache = ResultCache()
+    run = Future()
+    first, _ = cache.get_or_run("k", lambda: run)
+    second, _ = cache.get_or_run("k", lambda: pytest.fail("started twice"))
+    # The first client disconnects while the run is still going
+    assert first.cancel()
+
+    run.set_result("done")
+    assert second.result(timeout=1) == "done"
+    third, replayed = cache.get_or_run("k", lambda: pytest.fail("started twice"))
+    assert replayed and third.result(timeout=1) == "done"
@@ -0,0 +1,26 @@
+# backend/tests/test_pdf_text.py
+from backend.utils import pdf_text
+
+
+def test_cache_key_follows_content_not_path(tmp_path):
+    first = tmp_path / "a" / "report.pdf"
+    second = tmp_path / "b" / "scan.pdf"
+    for path in (first, second):
+        path.parent.mkdir()
+        path.write_bytes(b"%PDF-1.7 same bytes")
+    assert pdf_text._file_key(str(first)) == pdf_text._file_key(str(second))
+
+    second.write_bytes(b"%PDF-1.7 other bytes")
+    assert pdf_text._file_key(str(first)) != pdf_text._file_key(str(second))
+
+
+def test_fully_cached_file_is_served_without_parsing(tmp_path, monkeypatch):
+    path = tmp_path / "claim.pdf"
+    path.write_bytes(b"%PDF-1.7 cached")
+    key = pdf_text._file_key(str(path))
+    monkeypatch.setattr(pdf_text, "_page_cache", type(pdf_text._page_cache)())
+    monkeypatch.setattr(pdf_text, "_page_counts", type(pdf_text._page_counts)())
+    pdf_text._count_put(key, 2)
+    pdf_text._cache_put((key, 0, pdf_text.OCR_DPI), "page one")
+    pdf_text._cache_put((key, 1, pdf_text.OCR_DPI), "page two")
+    assert list(pdf_text.iter_pdf_pages(str(path))) == ["page one", "page two"]
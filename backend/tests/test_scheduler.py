@@ -0,0 +1,48 @@
+# backend/tests/test_scheduler.py
+import threading
+
+from backend.scheduler import ClaimRejected, ClaimScheduler, HEAVY_COST_THRESHOLD
+
+HEAVY_COST = max(HEAVY_COST_THRESHOLD, 30)
+
+
+def _submit_all(scheduler, count, cost, fn):
+    futures, shed = [], 0
+    for _ in range(count):
+        try:
+            futures.append(scheduler.submit(fn, cost))
+        except ClaimRejected:
+            shed += 1
+    return futures, shed
+
+
+def test_heavy_burst_is_admitted_while_workers_are_idle():
+    scheduler = ClaimScheduler(workers=4, slo_seconds=30)
+    release = threading.Event()
+    futures, shed = _submit_all(scheduler, 10, HEAVY_COST, release.wait)
+    try:
+        # Three heavy slots plus one claim queued behind them fit the SLO;
+        # nothing is shed while a usable worker is idle
+        assert len(futures) >= scheduler.workers - 1
+        assert shed == 10 - len(futures)
+        assert scheduler.metrics()["lanes"]["heavy"]["shed"] == shed
+    finally:
+        release.set()
+    for future in futures:
+        assert future.result(timeout=5) is True
+
+
+def test_light_claim_runs_while_heavy_claims_hold_their_workers():
+    scheduler = ClaimScheduler(workers=4, slo_seconds=1000)
+    release = threading.Event()
+    heavy, shed = _submit_all(scheduler, 6, HEAVY_COST, release.wait)
+    try:
+        assert shed == 0
+        light = scheduler.submit(lambda: "light", 1)
+        assert light.result(timeout=5) == "light"
+        assert not any(future.done() for future in heavy)
+        assert scheduler.metrics()["in_flight"] == scheduler.workers - 1
+    finally:
+        release.set()
+    for future in heavy:
+        assert future.result(timeout=5) is True
@@ -0,0 +1,79 @@
+# backend/tests/test_store.py
+import pytest
+
+from backend.store import ClaimStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ClaimStore(str(tmp_path / "claims.db"))
+    for i in range(7):
+        store.save({
+            "claim_id": f"c{i}",
+            "created_at": f"2025-08-1{i}T00:00:00.000",
+            "category": "Auto" if i % 2 else "Health",
+            "validation_status": "fail" if i < 3 else "success",
+            "missing_documents": ["Bills"],
+            "timings": {"graph_seconds": 1.5},
+        })
+    store.close()
+    # Reopen so reads see everything the writer flushed
+    return ClaimStore(store.path)
+
+
+def test_keyset_pagination_walks_every_claim_once(store):
+    seen, cursor = [], None
+    while True:
+        page = store.query(limit=3, cursor=cursor)
+        seen += [item["claim_id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ["c6", "c5", "c4", "c3", "c2", "c1", "c0"]
+
+
+def test_filters(store):
+    items = store.query(status="fail", category="Auto")["items"]
+    assert [item["claim_id"] for item in items] == ["c1"]
+    items = store.query(since="2025-08-14", until="2025-08-16")["items"]
+    assert [item["claim_id"] for item in items] == ["c5", "c4"]
+
+
+def test_json_columns_round_trip(store):
+    record = store.get("c2")
+    assert record["missing_documents"] == ["Bills"]
+    assert record["timings"] == {"graph_seconds": 1.5}
+
+
+def test_summary_from_aggregates(store):
+    assert store.summary() == {
+        "total": 7,
+        "by_status": {"fail": 3, "success": 4},
+        "by_category": {"Health": 4, "Auto": 3},
+    }
+
+
+def test_bad_record_does_not_stop_the_writer(store):
+    store.save({"claim_id": "bad", "created_at": "2025-09-01", "timings": {1, 2}})
+    store.save({"claim_id": "c7", "created_at": "2025-09-02", "validation_status": "success"})
+    store.save({"claim_id": "c7", "created_at": "2025-09-02", "validation_status": "success"})
+    store.close()
+    assert store.get("bad") is None
+    assert store.get("c7") is not None
+    assert store.summary()["total"] == 8
+
+
+def test_invalid_cursor(store):
+    with pytest.raises(ValueError):
+        store.query(cursor="nonsense")
+
+
+def test_time_range_accepts_any_iso_form(store):
+    items = store.query(since="2025-08-14T00:00", until="2025-08-15T00:00:00.000")["items"]
+    assert [item["claim_id"] for item in items] == ["c4"]
+
+
+@pytest.mark.parametrize("bounds", [{"since": "yesterday"}, {"until": "2025-13-01"}])
+def test_invalid_time_range_is_rejected(store, bounds):
+    with pytest.raises(ValueError):
+        store.query(**bounds)
@@ -0,0 +1,224 @@
+# backend/utils/claim_rules.py
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, List, Optional, Pattern, Tuple
+
+# One rules file per insurer product line: <CLAIM_RULES_DIR>/<product_line>.json
+CLAIM_RULES_DIR = os.getenv(
+    "CLAIM_RULES_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "rules")
+)
+DEFAULT_PRODUCT_LINE = "default"
+FALLBACK_CATEGORY = "Other"
+
+
+class RulesValidationError(ValueError):
+    """Raised when a rules file is malformed. The active rules are left untouched."""
+
+
+def _keyword_matcher(keywords: List[str]) -> Optional[Pattern]:
+    # Longest keywords first so the alternation prefers the most specific match
+    if not keywords:
+        return None
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered), re.IGNORECASE)
+
+
+class ClaimRules:
+    """
+    A compiled, read-only rules table. Built once per load and swapped in whole,
+    so readers never see a half-applied update.
+    """
+
+    def __init__(self, data: Dict, product_line: str = DEFAULT_PRODUCT_LINE):
+        _validate(data)
+        canonical = json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        digest = hashlib.sha256(canonical).hexdigest()[:12]
+
+        self.product_line = product_line
+        self.version = f"{product_line}:{data.get('version', '0')}:{digest}"
+        self.categories: List[str] = list(data["categories"])
+        self.required_docs: Dict[str, List[str]] = {
+            name: list(spec.get("required_docs", []))
+            for name, spec in data["categories"].items()
+        }
+        self.category_keywords: Dict[str, List[str]] = {
+            name: list(spec.get("keywords", []))
+            for name, spec in data["categories"].items()
+        }
+        self.messages: Dict[str, str] = {
+            name: spec.get("message", "Claim processed successfully.")
+            for name, spec in data["categories"].items()
+        }
+        self.doc_keywords: Dict[str, List[str]] = {
+            doc: list(keywords) for doc, keywords in data["documents"].items()
+        }
+
+        # ---- Compiled matchers ----
+        self._doc_matchers = {
+            doc: _keyword_matcher(keywords) for doc, keywords in self.doc_keywords.items()
+        }
+        self._category_matchers = {
+            name: _keyword_matcher(keywords)
+            for name, keywords in self.category_keywords.items()
+        }
+
+    def docs_for(self, category: str) -> List[str]:
+        return self.required_docs.get(category, [])
+
+    def message_for(self, category: str) -> str:
+        return self.messages.get(category, "Claim processed successfully.")
+
+    def document_matches(self, doc: str, text: str) -> bool:
+        matcher = self._doc_matchers.get(doc)
+        return bool(matcher and matcher.search(text))
+
+    def category_matches(self, category: str, text: str) -> bool:
+        matcher = self._category_matchers.get(category)
+        return bool(matcher and matcher.search(text))
+
+    def resolve_category(self, category: Optional[str]) -> str:
+        """Case-insensitive lookup of a category name, falling back to 'Other'."""
+        if category:
+            for name in self.categories:
+                if name.lower() == category.strip().lower():
+                    return name
+        return FALLBACK_CATEGORY
+
+
+# ---- Validation ----
+def _is_str_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) and v.strip() for v in value)
+
+
+def _validate(data: Dict):
+    if not isinstance(data, dict):
+        raise RulesValidationError("Rules must be a JSON object")
+
+    categories = data.get("categories")
+    documents = data.get("documents")
+    if not isinstance(categories, dict) or not categories:
+        raise RulesValidationError("'categories' must be a non-empty object")
+    if not isinstance(documents, dict):
+        raise RulesValidationError("'documents' must be an object")
+    if FALLBACK_CATEGORY not in categories:
+        raise RulesValidationError(f"'{FALLBACK_CATEGORY}' category is required")
+    if "version" in data and not isinstance(data["version"], str):
+        raise RulesValidationError("'version' must be a string")
+
+    for name, spec in categories.items():
+        if not isinstance(spec, dict):
+            raise RulesValidationError(f"Category '{name}' must be an object")
+        if not _is_str_list(spec.get("required_docs", [])):
+            raise RulesValidationError(f"Category '{name}': 'required_docs' must be a list of strings")
+        if not _is_str_list(spec.get("keywords", [])):
+            raise RulesValidationError(f"Category '{name}': 'keywords' must be a list of strings")
+        if "message" in spec and not isinstance(spec["message"], str):
+            raise RulesValidationError(f"Category '{name}': 'message' must be a string")
+        for doc in spec.get("required_docs", []):
+            if doc not in documents:
+                raise RulesValidationError(f"Category '{name}' requires unknown document '{doc}'")
+
+    for doc, keywords in documents.items():
+        if not _is_str_list(keywords) or not keywords:
+            raise RulesValidationError(f"Document '{doc}' needs a non-empty list of keywords")
+
+
+# ---- Active rules registry ----
+# product line -> (rules, (mtime_ns, size) of the file they were loaded from)
+_active: Dict[str, Tuple[ClaimRules, Optional[tuple]]] = {}
+_lock = threading.Lock()
+
+
+def _rules_path(product_line: str) -> str:
+    if not re.fullmatch(r"[A-Za-z0-9_\-]+", product_line):
+        raise RulesValidationError(f"Invalid product line name: {product_line!r}")
+    return os.path.join(CLAIM_RULES_DIR, f"{product_line}.json")
+
+
+def _write_rules_file(path: str, data: Dict):
+    # Temp file in the same directory + os.replace, so readers never see a partial file
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".json.tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_rules(product_line: str = DEFAULT_PRODUCT_LINE) -> ClaimRules:
+    """Read and compile the rules file for a product line (does not activate it)."""
+    path = _rules_path(product_line)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise RulesValidationError(f"No rules file for product line '{product_line}'")
+    except json.JSONDecodeError as e:
+        raise RulesValidationError(f"Rules file is not valid JSON: {e}")
+    return ClaimRules(data, product_line)
+
+
+def _file_stamp(path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def reload_rules(product_line: str = DEFAULT_PRODUCT_LINE, data: Optional[Dict] = None) -> ClaimRules:
+    """
+    Compile new rules (from `data` or from disk) and atomically swap them in.
+    Posted `data` is written to the product line's rules file first, so it
+    survives restarts and other worker processes see the file change on
+    their next get_rules call.
+    Raises RulesValidationError and keeps the old rules if they don't validate.
+    """
+    path = _rules_path(product_line)
+    if data is None:
+        # Stamp before reading, so a write racing the read triggers another load
+        stamp = _file_stamp(path)
+        rules = load_rules(product_line)
+    else:
+        rules = ClaimRules(data, product_line)
+        _write_rules_file(path, data)
+        stamp = _file_stamp(path)
+    with _lock:
+        _active[product_line] = (rules, stamp)
+    return rules
+
+
+def get_rules(product_line: Optional[str] = None) -> ClaimRules:
+    """
+    Currently active rules for a product line. Loads them on first use and
+    again whenever the rules file has changed on disk (e.g. a reload served
+    by another worker process).
+    """
+    product_line = product_line or DEFAULT_PRODUCT_LINE
+    path = _rules_path(product_line)
+    stamp = _file_stamp(path)
+    entry = _active.get(product_line)
+    if entry is not None and (stamp is None or entry[1] == stamp):
+        return entry[0]
+    with _lock:
+        entry = _active.get(product_line)
+        if entry is not None and (stamp is None or entry[1] == stamp):
+            return entry[0]
+        try:
+            rules = load_rules(product_line)
+        except RulesValidationError as e:
+            if entry is None:
+                raise
+            # A bad edit on disk must not take down claim processing
+            print(f"Rules reload error for '{product_line}', keeping version {entry[0].version}: {e}")
+            rules = entry[0]
+        _active[product_line] = (rules, stamp)
+    return rules
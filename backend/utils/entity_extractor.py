@@ -0,0 +1,244 @@
+# backend/utils/entity_extractor.py
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# Fields below this confidence are left for the LLM to resolve
+MIN_CONFIDENCE = 0.6
+
+MONTHS = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9, "oct": 10,
+    "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12,
+}
+WEEKDAYS = {
+    "monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+    "friday": 4, "saturday": 5, "sunday": 6,
+}
+NUMBER_WORDS = {
+    "a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+
+# Month names match in any case, except "May", which must be capitalized so
+# the verb ("may 5 things happen") isn't read as a date
+_MONTH = (
+    r"(?P<month>(?i:"
+    + "|".join(sorted((m for m in MONTHS if m != "may"), key=len, reverse=True))
+    + r")|May)\.?"
+)
+_DAY = r"(?P<day>\d{1,2})(?:st|nd|rd|th)?"
+_YEAR = r"(?P<year>\d{4})"
+
+# ---- Compiled date patterns, most specific first ----
+DATE_PATTERNS = [
+    # 2025-08-12
+    (re.compile(r"\b(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})\b"), 0.95),
+    # 08/12/2025 or 8-12-25 (month/day as in the US; day/month when month > 12)
+    (re.compile(r"\b(?P<month>\d{1,2})([/\-])(?P<day>\d{1,2})\2(?P<year>\d{4}|\d{2})\b"), 0.8),
+    # August 12th, 2025 / Aug 12
+    (re.compile(rf"\b{_MONTH}\s+{_DAY}(?:,?\s+{_YEAR})?\b"), 0.9),
+    # 12th of August 2025 / 12 Aug
+    (re.compile(rf"\b{_DAY}\s+(?:of\s+)?{_MONTH}(?:,?\s+{_YEAR})?\b"), 0.9),
+]
+
+RELATIVE_PATTERNS = [
+    (re.compile(r"\bday before yesterday\b", re.IGNORECASE), lambda ref, m: ref - timedelta(days=2), 0.9),
+    (re.compile(r"\byesterday\b", re.IGNORECASE), lambda ref, m: ref - timedelta(days=1), 0.9),
+    (re.compile(r"\b(?:today|this morning|this afternoon|tonight|earlier today)\b", re.IGNORECASE), lambda ref, m: ref, 0.85),
+    (
+        re.compile(r"\b(?P<n>\d+|" + "|".join(NUMBER_WORDS) + r")\s+(?P<unit>day|week|month)s?\s+ago\b", re.IGNORECASE),
+        lambda ref, m: _ago(ref, m.group("n"), m.group("unit")),
+        0.75,
+    ),
+    (
+        re.compile(r"\b(?:last|this past|on)\s+(?P<weekday>" + "|".join(WEEKDAYS) + r")\b", re.IGNORECASE),
+        lambda ref, m: _last_weekday(ref, WEEKDAYS[m.group("weekday").lower()]),
+        0.8,
+    ),
+    # Vague: we only know roughly when, so confidence sits right at the threshold
+    (re.compile(r"\blast week\b", re.IGNORECASE), lambda ref, m: ref - timedelta(days=7), 0.6),
+    (re.compile(r"\blast month\b", re.IGNORECASE), lambda ref, m: _ago(ref, "1", "month"), 0.5),
+]
+
+# ---- Clause cues for choosing between several dates ----
+CLAUSE_BREAK = re.compile(r"[.;,!?\n]")
+INCIDENT_CUES = re.compile(
+    r"\b(?:accident|crash(?:ed)?|collision|incident|happened|occurred|injur\w*|hurt|stolen|theft|"
+    r"broke(?:n)?|damaged?|fire|flood\w*|storm|fell|slipped|hit|rear-ended|surgery|hospitali[sz]ed|"
+    r"cancell?ed|delayed|lost|died|passed away)\b",
+    re.IGNORECASE,
+)
+# Dates that describe the claimant or the policy rather than the incident
+NON_INCIDENT_CUES = re.compile(
+    r"\b(?:DOB|D\.O\.B|born|birth(?:day|date)?|date of birth|expir\w*|valid until|policy (?:start|date))\b",
+    re.IGNORECASE,
+)
+
+# ---- Compiled name patterns ----
+_NAME = r"(?P<name>[A-Z][a-zA-Z'\-]+(?:\s+[A-Z][a-zA-Z'\-]+){0,2})"
+NAME_PATTERNS = [
+    (re.compile(rf"\b(?:[Mm]y name is|[Nn]ame\s*:)\s+{_NAME}"), 0.95),
+    (re.compile(rf"\b(?:[Tt]his is|[Ss]igned,?)\s+{_NAME}"), 0.75),
+    (re.compile(rf"\b(?:I am|I'm|I’m)\s+{_NAME}"), 0.7),
+]
+# Single words are often not names at all ("This is Urgent"), so only an
+# explicit "My name is" keeps one above MIN_CONFIDENCE
+SINGLE_WORD_PENALTY = 0.2
+# Capitalized words that follow "I am" etc. but aren't names
+NAME_STOPWORDS = {
+    "writing", "filing", "sorry", "not", "very", "calling", "here", "unable",
+    "the", "a", "an", "my", "on", "in", "at", "to", "and", "because", "injured",
+    "i'm", "im", "we", "was", "had", "have", "from", "with", "last", "yesterday",
+}
+
+
+def _ago(ref: date, n: str, unit: str) -> date:
+    count = NUMBER_WORDS.get(n.lower()) if not n.isdigit() else int(n)
+    unit = unit.lower()
+    if unit == "day":
+        return ref - timedelta(days=count)
+    if unit == "week":
+        return ref - timedelta(weeks=count)
+    month = ref.month - count
+    year = ref.year + (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return ref.replace(year=year, month=month, day=min(ref.day, 28))
+
+
+def _last_weekday(ref: date, weekday: int) -> date:
+    days_back = (ref.weekday() - weekday) % 7 or 7
+    return ref - timedelta(days=days_back)
+
+
+def _absolute_date(match: re.Match, ref: date) -> Optional[Tuple[date, bool]]:
+    """Builds a date from a match; the flag says whether the year was inferred."""
+    month = match.group("month")
+    month = int(month) if month.isdigit() else MONTHS[month.lower().rstrip(".")]
+    day = int(match.group("day"))
+    if month > 12 and day <= 12:
+        # 13/08/2025 can only be day-first
+        month, day = day, month
+    year = match.group("year")
+    inferred = year is None
+    if inferred:
+        year = ref.year
+    else:
+        year = int(year)
+        if year < 100:
+            year += 2000
+    try:
+        value = date(year, month, day)
+    except ValueError:
+        return None
+    # "Aug 12th" with no year means the most recent Aug 12th; Feb 29 may
+    # need to go back to the last leap year
+    while inferred and value > ref:
+        year -= 1
+        try:
+            value = date(year, month, day)
+        except ValueError:
+            continue
+    return value, inferred
+
+
+def _clause(text: str, start: int, end: int) -> str:
+    # The clause around a match, ignoring breaks inside it ("August 12th, 2025")
+    left = max((m.end() for m in CLAUSE_BREAK.finditer(text, 0, start)), default=0)
+    right = CLAUSE_BREAK.search(text, end)
+    return text[left:right.start() if right else len(text)]
+
+
+def _date_candidates(text: str, ref: date) -> List[Tuple[str, float, str]]:
+    """Every date mention as (ISO date, confidence, clause), most specific patterns first."""
+    candidates, taken = [], []
+
+    def overlaps(match: re.Match) -> bool:
+        return any(match.start() < end and start < match.end() for start, end in taken)
+
+    for pattern, confidence in DATE_PATTERNS:
+        for match in pattern.finditer(text):
+            if overlaps(match):
+                continue
+            parsed = _absolute_date(match, ref)
+            if parsed is None:
+                continue
+            value, inferred = parsed
+            score = confidence
+            if value > ref:
+                # Incidents can't be in the future; likely a day/month swap or typo
+                score -= 0.3
+            if inferred:
+                score -= 0.1
+            taken.append(match.span())
+            candidates.append((value.isoformat(), round(score, 2), _clause(text, *match.span())))
+
+    for pattern, resolve, confidence in RELATIVE_PATTERNS:
+        for match in pattern.finditer(text):
+            if overlaps(match):
+                continue
+            taken.append(match.span())
+            candidates.append((resolve(ref, match).isoformat(), confidence, _clause(text, *match.span())))
+    return candidates
+
+
+def extract_incident_date(text: str, reference_time: Optional[datetime] = None) -> Tuple[Optional[str], float]:
+    """
+    Finds the incident date in free text, resolving relative phrases against
+    `reference_time` (the submission time). Returns (ISO date or None, confidence).
+    """
+    ref = (reference_time or datetime.now()).date()
+    candidates = [c for c in _date_candidates(text, ref) if not NON_INCIDENT_CUES.search(c[2])]
+    if not candidates:
+        return None, 0.0
+    if len({value for value, _, _ in candidates}) == 1:
+        value, confidence, _ = max(candidates, key=lambda c: c[1])
+        return value, confidence
+
+    # Several different dates: take the one in a clause about the incident
+    near_incident = [c for c in candidates if INCIDENT_CUES.search(c[2])]
+    if len({value for value, _, _ in near_incident}) == 1:
+        value, confidence, _ = max(near_incident, key=lambda c: c[1])
+        return value, confidence
+    # Can't tell which one is the incident; keep a guess but leave it to the LLM
+    value, confidence, _ = candidates[0]
+    return value, min(confidence, round(MIN_CONFIDENCE - 0.1, 2))
+
+
+def extract_claimant_name(text: str) -> Tuple[Optional[str], float]:
+    """Finds a self-introduced claimant name. Returns (name or None, confidence)."""
+    for pattern, confidence in NAME_PATTERNS:
+        for match in pattern.finditer(text):
+            words = match.group("name").split()
+            # Trim trailing words that are clearly not part of a name
+            while words and words[-1].lower() in NAME_STOPWORDS:
+                words.pop()
+            if not words or words[0].lower() in NAME_STOPWORDS:
+                continue
+            score = confidence - SINGLE_WORD_PENALTY if len(words) == 1 else confidence
+            return " ".join(words), round(score, 2)
+    return None, 0.0
+
+
+def extract_entities(text: str, reference_time: Optional[datetime] = None) -> Dict[str, Dict]:
+    """
+    Deterministic intake extraction. Returns, per field, the value (or None)
+    and a 0-1 confidence; fields under MIN_CONFIDENCE should go to the LLM.
+    """
+    text = text or ""
+    name, name_conf = extract_claimant_name(text)
+    incident_date, date_conf = extract_incident_date(text, reference_time)
+    description = text.strip() or None
+    return {
+        "claimant_name": {"value": name, "confidence": name_conf},
+        "incident_date": {"value": incident_date, "confidence": date_conf},
+        "incident_description": {"value": description, "confidence": 0.8 if description else 0.0},
+    }
+
+
+def unresolved_fields(entities: Dict[str, Dict]) -> list:
+    return [
+        field for field, result in entities.items()
+        if result["value"] is None or result["confidence"] < MIN_CONFIDENCE
+    ]
@@ -0,0 +1,284 @@
+# backend/utils/extractors.py
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from typing import Callable, Dict, Iterator, Optional
+from xml.etree import ElementTree
+
+from backend.utils.pdf_text import iter_pdf_pages, page_error_count
+
+# HEIC support is optional: pillow-heif registers an opener with PIL when installed
+try:
+    from pillow_heif import register_heif_opener
+
+    register_heif_opener()
+    HEIC_SUPPORTED = True
+except ImportError:
+    HEIC_SUPPORTED = False
+
+SNIFF_BYTES = 512
+# Guards against zip bombs in uploaded bundles
+ZIP_MAX_MEMBERS = int(os.getenv("ZIP_MAX_MEMBERS", "50"))
+ZIP_MAX_MEMBER_BYTES = int(os.getenv("ZIP_MAX_MEMBER_BYTES", str(50 * 1024 * 1024)))
+ZIP_MAX_TOTAL_BYTES = int(os.getenv("ZIP_MAX_TOTAL_BYTES", str(200 * 1024 * 1024)))
+ZIP_MAX_RATIO = float(os.getenv("ZIP_MAX_RATIO", "100"))
+
+PageExtractor = Callable[[str], Iterator[str]]
+
+EXTRACTORS: Dict[str, PageExtractor] = {}
+_stats: Dict[str, Dict[str, float]] = {}
+_stats_lock = threading.Lock()
+
+
+def register_extractor(fmt: str):
+    """Decorator that registers a page extractor for a sniffed format."""
+
+    def decorator(fn: PageExtractor) -> PageExtractor:
+        EXTRACTORS[fmt] = fn
+        _stats.setdefault(fmt, {"files": 0, "pages": 0, "errors": 0, "page_errors": 0, "seconds": 0.0})
+        return fn
+
+    return decorator
+
+
+# ---- Format detection ----
+# HEVC-coded HEIF brands only; generic HEIF brands (mif1/msf1) also cover AVIF
+HEIC_BRANDS = {b"heic", b"heix", b"hevc", b"hevx", b"heim", b"heis", b"hevm", b"hevs"}
+
+
+def _ftyp_brands(head: bytes) -> set:
+    # ftyp box: size, "ftyp", major brand, minor version, compatible brands...
+    box_size = min(int.from_bytes(head[0:4], "big"), len(head))
+    brands = {head[8:12]}
+    for offset in range(16, box_size - 3, 4):
+        brands.add(head[offset:offset + 4])
+    return brands
+
+
+def sniff_bytes(head: bytes, file_path: Optional[str] = None) -> Optional[str]:
+    """Detects a file format from its leading bytes, ignoring the file name."""
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"II*\x00") or head.startswith(b"MM\x00*"):
+        return "tiff"
+    if head[4:8] == b"ftyp" and _ftyp_brands(head) & HEIC_BRANDS:
+        return "heic"
+    if head.startswith(b"PK\x03\x04"):
+        if file_path:
+            try:
+                with zipfile.ZipFile(file_path) as zf:
+                    if "word/document.xml" in zf.namelist():
+                        return "docx"
+            except zipfile.BadZipFile:
+                return None
+        return "zip"
+    if b"\x00" not in head:
+        try:
+            head.decode("utf-8")
+            return "text"
+        except UnicodeDecodeError as e:
+            # A multi-byte character cut off at the end of the sniff window is fine
+            if e.start >= len(head) - 3:
+                return "text"
+    return None
+
+
+def sniff_format(file_path: str) -> Optional[str]:
+    try:
+        with open(file_path, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+    except OSError:
+        return None
+    if not head:
+        return None
+    return sniff_bytes(head, file_path)
+
+
+# ---- Format plugins ----
+# PIL and pytesseract are only imported by the OCR plugins that use them
+def _ocr(image) -> str:
+    import pytesseract
+
+    return pytesseract.image_to_string(image)
+
+
+def _page_error(fmt: str, what: str, e: Exception):
+    # A bad page, frame or bundle member is counted and skipped, the rest of the file is kept
+    with _stats_lock:
+        _stats[fmt]["page_errors"] += 1
+    print(f"{what} read error: {e}")
+
+
+@register_extractor("pdf")
+def _pdf_pages(file_path: str) -> Iterator[str]:
+    yield from iter_pdf_pages(file_path)
+
+
+@register_extractor("png")
+@register_extractor("jpeg")
+def _image_pages(file_path: str) -> Iterator[str]:
+    from PIL import Image
+
+    with Image.open(file_path) as img:
+        yield _ocr(img)
+
+
+@register_extractor("tiff")
+def _tiff_pages(file_path: str) -> Iterator[str]:
+    from PIL import Image, ImageSequence
+
+    # Multi-page TIFF: one OCR pass per frame
+    with Image.open(file_path) as img:
+        for index, frame in enumerate(ImageSequence.Iterator(img)):
+            try:
+                text = _ocr(frame.convert("RGB"))
+            except Exception as e:
+                _page_error("tiff", f"TIFF frame {index + 1}", e)
+                text = ""
+            yield text
+
+
+@register_extractor("heic")
+def _heic_pages(file_path: str) -> Iterator[str]:
+    if not HEIC_SUPPORTED:
+        raise RuntimeError("HEIC support requires pillow-heif")
+    from PIL import Image
+
+    with Image.open(file_path) as img:
+        yield _ocr(img.convert("RGB"))
+
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+@register_extractor("docx")
+def _docx_pages(file_path: str) -> Iterator[str]:
+    # DOCX has no fixed pagination; yield the document body as one page
+    with zipfile.ZipFile(file_path) as zf:
+        root = ElementTree.fromstring(zf.read("word/document.xml"))
+    paragraphs = []
+    for para in root.iter(f"{_WORD_NS}p"):
+        paragraphs.append("".join(node.text or "" for node in para.iter(f"{_WORD_NS}t")))
+    yield "\n".join(paragraphs)
+
+
+@register_extractor("text")
+def _text_pages(file_path: str) -> Iterator[str]:
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        yield f.read()
+
+
+def zip_members(zf: zipfile.ZipFile) -> list:
+    """Members of a bundle that pass the size, count and compression-ratio limits."""
+    members = []
+    total = 0
+    for member in zf.infolist():
+        if member.is_dir():
+            continue
+        if len(members) >= ZIP_MAX_MEMBERS:
+            break
+        if member.file_size > ZIP_MAX_MEMBER_BYTES:
+            continue
+        if member.file_size > ZIP_MAX_RATIO * max(member.compress_size, 1):
+            continue
+        if total + member.file_size > ZIP_MAX_TOTAL_BYTES:
+            break
+        total += member.file_size
+        members.append(member)
+    return members
+
+
+def _copy_limited(src, dst, limit: int) -> bool:
+    # Declared sizes can lie, so enforce the limit on bytes actually written
+    written = 0
+    while chunk := src.read(1024 * 1024):
+        written += len(chunk)
+        if written > limit:
+            return False
+        dst.write(chunk)
+    return True
+
+
+@register_extractor("zip")
+def _zip_pages(file_path: str) -> Iterator[str]:
+    # Each member is sniffed on its own; nested bundles are not expanded
+    tmp_dir = tempfile.mkdtemp(prefix="claim_zip_")
+    try:
+        with zipfile.ZipFile(file_path) as zf:
+            for index, member in enumerate(zip_members(zf)):
+                member_path = os.path.join(tmp_dir, f"{index}_{os.path.basename(member.filename)}")
+                try:
+                    with zf.open(member) as src, open(member_path, "wb") as dst:
+                        complete = _copy_limited(src, dst, member.file_size)
+                    if not complete:
+                        continue
+                    fmt = sniff_format(member_path)
+                    if fmt in (None, "zip"):
+                        continue
+                    yield from iter_pages(member_path, fmt)
+                except Exception as e:
+                    _page_error("zip", f"ZIP member {member.filename}", e)
+                finally:
+                    # Free temp space as we go rather than holding the whole bundle
+                    if os.path.exists(member_path):
+                        os.remove(member_path)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+# ---- Public API ----
+def iter_pages(file_path: str, fmt: Optional[str] = None) -> Iterator[str]:
+    """
+    Yields the text of each page of a document, choosing the decoder from the
+    file's content rather than its extension. Raises ValueError for formats
+    with no registered extractor.
+    """
+    fmt = fmt or sniff_format(file_path)
+    extractor = EXTRACTORS.get(fmt)
+    if extractor is None:
+        raise ValueError(f"Unsupported file format: {os.path.basename(file_path)}")
+
+    pages = 0
+    started = time.perf_counter()
+    try:
+        for text in extractor(file_path):
+            pages += 1
+            yield text
+    except Exception:
+        with _stats_lock:
+            _stats[fmt]["errors"] += 1
+        raise
+    finally:
+        with _stats_lock:
+            stats = _stats[fmt]
+            stats["files"] += 1
+            stats["pages"] += pages
+            stats["seconds"] += time.perf_counter() - started
+
+
+def extract_document_text(file_path: str) -> str:
+    """All pages of a document joined into one string."""
+    return " ".join(iter_pages(file_path))
+
+
+def extractor_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Per-format file, page, error counts and total extraction time.
+    Time for "zip" includes its members, which are also counted under their own format.
+    "page_errors" counts single PDF pages, TIFF frames and ZIP members that
+    failed while the rest of the file was kept.
+    """
+    with _stats_lock:
+        result = {
+            fmt: {**stats, "seconds": round(stats["seconds"], 3)}
+            for fmt, stats in _stats.items()
+        }
+    result["pdf"]["page_errors"] = page_error_count()
+    return result
@@ -0,0 +1,125 @@
+# backend/utils/pdf_text.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Iterator
+
+# ---- Settings (override via environment) ----
+OCR_DPI = int(os.getenv("PDF_OCR_DPI", "200"))
+# A page with fewer non-space characters than this is treated as scanned
+MIN_TEXT_LAYER_CHARS = int(os.getenv("PDF_MIN_TEXT_LAYER_CHARS", "20"))
+PAGE_CACHE_SIZE = int(os.getenv("PDF_PAGE_CACHE_SIZE", "2048"))
+
+_page_cache: "OrderedDict[tuple, str]" = OrderedDict()
+# Page count per file, so a fully cached file can be served without opening it
+_page_counts: "OrderedDict[str, int]" = OrderedDict()
+_cache_lock = threading.Lock()
+_page_errors = 0
+
+
+def _file_key(file_path: str) -> str:
+    # Content hash: every upload is stored under a fresh directory, so only
+    # the bytes identify a resubmitted document
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cache_get(key: tuple):
+    with _cache_lock:
+        text = _page_cache.get(key)
+        if text is not None:
+            _page_cache.move_to_end(key)
+        return text
+
+
+def _cache_put(key: tuple, text: str):
+    with _cache_lock:
+        _page_cache[key] = text
+        _page_cache.move_to_end(key)
+        while len(_page_cache) > PAGE_CACHE_SIZE:
+            _page_cache.popitem(last=False)
+
+
+def _count_get(file_key: str):
+    with _cache_lock:
+        return _page_counts.get(file_key)
+
+
+def _count_put(file_key: str, count: int):
+    with _cache_lock:
+        _page_counts[file_key] = count
+        _page_counts.move_to_end(file_key)
+        while len(_page_counts) > PAGE_CACHE_SIZE:
+            _page_counts.popitem(last=False)
+
+
+def page_error_count() -> int:
+    """Pages whose text layer read, render or OCR failed since startup."""
+    return _page_errors
+
+
+def has_text_layer(page) -> bool:
+    """Cheap check on the parsed glyphs, without running layout extraction."""
+    count = 0
+    for char in page.chars:
+        if not char.get("text", "").isspace():
+            count += 1
+            if count >= MIN_TEXT_LAYER_CHARS:
+                return True
+    return False
+
+
+def page_text(page, dpi: int = OCR_DPI) -> str:
+    """Text layer if the page has one, otherwise OCR of the page rendered at `dpi`."""
+    if has_text_layer(page):
+        return page.extract_text() or ""
+    import pytesseract
+
+    image = page.to_image(resolution=dpi).original
+    return pytesseract.image_to_string(image)
+
+
+def iter_pdf_pages(file_path: str, dpi: int = OCR_DPI) -> Iterator[str]:
+    """
+    Yields the text of each PDF page. Digital pages use their text layer
+    directly; only scanned pages are rasterized and OCR'd. Results are cached
+    per page by file content, so re-reading the same document is free.
+    """
+    file_key = _file_key(file_path)
+
+    global _page_errors
+
+    # Fully cached file: skip parsing the PDF at all
+    page_count = _count_get(file_key)
+    if page_count is not None:
+        cached = [_cache_get((file_key, i, dpi)) for i in range(page_count)]
+        if all(text is not None for text in cached):
+            yield from cached
+            return
+
+    import pdfplumber
+
+    count = 0
+    with pdfplumber.open(file_path) as pdf:
+        for index, page in enumerate(pdf.pages):
+            key = (file_key, index, dpi)
+            text = _cache_get(key)
+            if text is None:
+                try:
+                    text = page_text(page, dpi)
+                    _cache_put(key, text)
+                except Exception as e:
+                    # One bad scanned page (or no tesseract) shouldn't cost us the
+                    # rest of the document; failed pages aren't cached, so they retry
+                    with _cache_lock:
+                        _page_errors += 1
+                    print(f"PDF page {index + 1} read error: {e}")
+                    text = ""
+            count += 1
+            yield text
+    _count_put(file_key, count)
+